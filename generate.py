@@ -1,15 +1,22 @@
-import hashlib
-import json
+import functools
+import itertools
 import logging
+import logging.handlers
+import os
+import queue
 import re
-from datetime import datetime
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 
-import yaml
+import mmh3
+import orjson
 from dotenv import load_dotenv
 
 from utils.build_prompt import PromptBuilder
 from utils.llm_clients import create_llm_client
+from utils.load_yaml import load_yaml
 
 """
 generate.py - config driven synthetic document generation
@@ -17,34 +24,61 @@ generate.py - config driven synthetic document generation
 
 load_dotenv()
 
-# basic now for debug
-logging.basicConfig(
-    filename="debug.log",
-    level=logging.DEBUG,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-)
 logger = logging.getLogger(__name__)
 
+OUTPUT_OPEN_TAG = "<output>"
+OUTPUT_CLOSE_TAG = "</output>"
+
+# sidecar index of saved documents, one {"doc_id", "profile"} JSON object per line
+INDEX_FILENAME = "_index.jsonl"
+PROFILE_FIELD_PATTERN = re.compile(rb'"profile"\s*:\s*"([^"]+)"')
+
+
+def configure_logging(log_path="debug.log"):
+    """
+    Basic now for debug: everything to debug.log
+    Records go through a queue so file writes happen on a listener thread,
+    not in the generation loop. Returns the started listener; stop it to flush
+    """
+    log_queue = queue.Queue()
+
+    file_handler = logging.FileHandler(log_path)
+    file_handler.setFormatter(
+        logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+    )
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.DEBUG)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    listener = logging.handlers.QueueListener(log_queue, file_handler)
+    listener.start()
+    return listener
+
 
 def load_pipeline_config(config_path):
     """
     Loads main configuration as defined in pipeline.yml
     """
-    with open(config_path, "r") as f:
-        return yaml.safe_load(f)
+    return load_yaml(config_path)
 
 
 def extract_output_content(response_text):
     """
     Extract content between <output> tags
     """
-    pattern = r"<output>(.*?)</output>"
-    match = re.search(pattern, response_text, re.DOTALL)
-
-    if match:
-        content = match.group(1).strip()
+    # literal tags, so two str.find scans rather than a DOTALL regex
+    start = response_text.find(OUTPUT_OPEN_TAG)
+    end = -1
+    if start != -1:
+        start += len(OUTPUT_OPEN_TAG)
+        end = response_text.find(OUTPUT_CLOSE_TAG, start)
+
+    if end != -1:
+        content = response_text[start:end].strip()
         logger.debug(
-            f"Successfully extracted content from <output> tags (length={len(content)} chars)"
+            "Successfully extracted content from <output> tags (length=%d chars)",
+            len(content),
         )
         return content
     else:
@@ -52,22 +86,192 @@ def extract_output_content(response_text):
         return response_text.strip()
 
 
-def save_document(output_dir, structure_name, profile_id, timestamp, prompt, content=None):
+def compute_doc_id(text):
+    """
+    128-bit murmurhash of document text as hex (uniqueness only, not security)
+    """
+    return format(mmh3.hash128(text.encode('utf-8')), '032x')
+
+
+class StreamingExtractor:
+    """
+    Streaming counterpart to extract_output_content + compute_doc_id
+    Feed response chunks as they arrive; the <output> tags are found with a
+    small state machine and the stripped content between them is hashed on
+    the fly, so doc_id is ready when the stream ends without a second pass
+    """
+
+    SEEKING, IN_OUTPUT, DONE = range(3)
+
+    def __init__(self):
+        self._state = self.SEEKING
+        self._hasher = mmh3.mmh3_x64_128()
+        self._chunks = []
+        self._content = []
+        # text held back in case it is the start of a tag split across chunks
+        self._pending = ""
+        # whitespace held back so trailing whitespace is stripped like str.strip()
+        self._whitespace = ""
+        self._started = False
+
+    def feed(self, chunk):
+        self._chunks.append(chunk)
+        if self._state == self.DONE:
+            return
+
+        text = self._pending + chunk
+        self._pending = ""
+
+        if self._state == self.SEEKING:
+            start = text.find(OUTPUT_OPEN_TAG)
+            if start == -1:
+                self._pending = text[-(len(OUTPUT_OPEN_TAG) - 1):]
+                return
+            self._state = self.IN_OUTPUT
+            text = text[start + len(OUTPUT_OPEN_TAG):]
+
+        end = text.find(OUTPUT_CLOSE_TAG)
+        if end != -1:
+            self._add_content(text[:end])
+            self._state = self.DONE
+            return
+
+        split = max(len(text) - (len(OUTPUT_CLOSE_TAG) - 1), 0)
+        self._add_content(text[:split])
+        self._pending = text[split:]
+
+    def finish(self):
+        """
+        Returns (content, doc_id), falling back to the full response text when
+        no complete tag pair was seen
+        """
+        if self._state != self.DONE:
+            logger.warning("No <output> tags found in response, using full response text")
+            content = "".join(self._chunks).strip()
+            return content, compute_doc_id(content)
+
+        content = "".join(self._content)
+        logger.debug(
+            "Successfully extracted content from <output> tags (length=%d chars)",
+            len(content),
+        )
+        return content, format(self._hasher.uintdigest(), "032x")
+
+    def _add_content(self, text):
+        if not self._started:
+            text = text.lstrip()
+            if not text:
+                return
+            self._started = True
+
+        stripped = text.rstrip()
+        if not stripped:
+            self._whitespace += text
+            return
+
+        emitted = self._whitespace + stripped
+        self._whitespace = text[len(stripped):]
+        self._hasher.update(emitted.encode("utf-8"))
+        self._content.append(emitted)
+
+
+def write_bytes(path, payload):
+    """
+    Write pre-serialised bytes to path with raw os.write calls, skipping the
+    buffered/text IO layers
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def write_document(output_dir, output, pretty_json=False):
+    """
+    Serialise a document dict to {output_dir}/{doc_id}.json and record it in
+    the sidecar index
+    Compact JSON by default; pretty_json indents for human reading
+    """
+    output_path = f"{output_dir}/{output['doc_id']}.json"
+    option = orjson.OPT_INDENT_2 if pretty_json else None
+    write_bytes(output_path, orjson.dumps(output, option=option))
+
+    # record in sidecar index so skip_existing doesn't need to parse every document
+    with open(f"{output_dir}/{INDEX_FILENAME}", "ab") as f:
+        index_entry = {"doc_id": output["doc_id"], "profile": output["profile"]}
+        f.write(orjson.dumps(index_entry) + b"\n")
+
+    logger.debug("Saved document to %s", output_path)
+
+
+class DocumentWriter:
+    """
+    Background thread that writes documents queued by save_document, so disk
+    writes overlap with the next LLM calls. Use as a context manager; exiting
+    flushes the queue and joins the thread
+    pretty_json sets indented output for every document this writer writes
+    """
+
+    def __init__(self, maxsize=128, pretty_json=False):
+        self.pretty_json = pretty_json
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._thread = threading.Thread(target=self._run, name="document-writer")
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def put(self, output_dir, output):
+        """
+        Queue a document for writing (blocks if the queue is full)
+        """
+        self._queue.put((output_dir, output))
+
+    def close(self):
+        """
+        Write any queued documents and stop the thread
+        """
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            output_dir, output = item
+            try:
+                write_document(output_dir, output, self.pretty_json)
+            except Exception as e:
+                logger.error("Error writing document %s: %s", output["doc_id"], e)
+                print(f"error: could not write {output['doc_id']} - {e}")
+
+
+def save_document(
+    output_dir, structure_name, profile_id, timestamp, prompt, content=None, doc_id=None,
+    writer=None,
+):
     """
     Saves output document as JSON file
     If content is None, only saves prompt (debugging prompt-only mode)
+    doc_id can be passed in if already computed, otherwise it is hashed here
+    output_dir is a path string (not a Path) and must already exist
+    If a DocumentWriter is given the write happens on its thread, otherwise
+    it is written here as compact JSON
     """
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    # use md5 of content as doc_id
-    if content is not None:
-        md5_hash = hashlib.md5(content.encode('utf-8')).hexdigest()
-    else:
-        # for prompt-only mode, use a hash of the prompt instead
-        md5_hash = hashlib.md5(prompt.encode('utf-8')).hexdigest()
+    # hash content as doc_id, or the prompt in prompt-only mode
+    if doc_id is None:
+        doc_id = compute_doc_id(content if content is not None else prompt)
 
     output = {
-        "doc_id": md5_hash,
+        "doc_id": doc_id,
         "document_name": structure_name,
         "document_sourcedb": "DocSynth",
         "profile": profile_id,
@@ -78,44 +282,195 @@ def save_document(output_dir, structure_name, profile_id, timestamp, prompt, con
     if content is not None:
         output["content"] = content
 
-    output_path = output_dir / f"{md5_hash}.json"
-    with open(output_path, "w") as f:
-        json.dump(output, f, indent=2)
+    if writer:
+        writer.put(output_dir, output)
+    else:
+        write_document(output_dir, output)
+
 
-    logger.debug(f"Saved document to {output_path}")
+@functools.lru_cache(maxsize=1)
+def _format_timestamp_second(epoch_second):
+    """
+    Format the per-second part of the timestamp, cached so strftime only runs
+    when the second changes
+    """
+    return time.strftime("%Y%m%d_%H%M%S", time.localtime(epoch_second))
 
 
 def generate_timestamp():
     """
-    Generate timestamp string
+    Generate timestamp string (YYYYmmdd_HHMMSS_mmm, millisecond resolution)
     """
-    return datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:19]
+    epoch_second, millis = divmod(time.time_ns() // 1_000_000, 1000)
+    return f"{_format_timestamp_second(epoch_second)}_{millis:03d}"
 
 
 def get_existing_profile_ids(output_dir):
     """
-    Scan output directory for existing JSON files and extract profile IDs
-    Reads the 'profile' field from each JSON file
+    Collect profile IDs of documents already in the output directory
+    Reads the sidecar index if it covers exactly the JSON files on disk,
+    otherwise rescans the JSON files and rewrites the index
     """
-    existing_profiles = set()
-
     if not output_dir.exists():
-        return existing_profiles
+        return set()
 
-    for json_file in output_dir.glob("*.json"):
-        try:
-            with open(json_file, 'r') as f:
-                data = json.load(f)
-                profile_id = data.get('profile')
-                if profile_id:
-                    existing_profiles.add(profile_id)
-        except (json.JSONDecodeError, KeyError) as e:
-            logger.warning(f"Could not read profile from {json_file.name}: {e}")
-            continue
+    index_path = output_dir / INDEX_FILENAME
+    index = _read_index(index_path)
+    if index is not None and index.keys() == _list_doc_ids(output_dir):
+        return {profile_id for profile_id in index.values() if profile_id}
+
+    logger.info("Index missing or stale, rescanning %s", output_dir)
+    return _rebuild_index(output_dir, index_path)
+
+
+def _list_doc_ids(output_dir):
+    """
+    doc_ids of the JSON files in the output directory (names only, no reads)
+    """
+    with os.scandir(output_dir) as entries:
+        return {
+            entry.name[:-len(".json")]
+            for entry in entries
+            if entry.name.endswith(".json") and entry.is_file()
+        }
+
+
+def _read_index(index_path):
+    """
+    Read the sidecar index as {doc_id: profile_id}, one JSON object per line
+    Returns None if there is no index
+    """
+    index = {}
+
+    try:
+        f = open(index_path, "rb")
+    except FileNotFoundError:
+        return None
+
+    with f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                entry = orjson.loads(line)
+            except orjson.JSONDecodeError as e:
+                logger.warning("Could not read index line %s: %s", line_number, e)
+                continue
+            index[entry.get("doc_id")] = entry.get("profile")
+
+    return index
+
+
+def _rebuild_index(output_dir, index_path):
+    """
+    Rewrite the sidecar index from the JSON files on disk and return their
+    profile IDs. Pulls the 'profile' field out of each file with a regex
+    rather than decoding the whole document
+    """
+    existing_profiles = set()
+
+    with os.scandir(output_dir) as entries, open(index_path, "wb") as index:
+        for entry in entries:
+            if not entry.name.endswith(".json") or not entry.is_file():
+                continue
+            with open(entry.path, "rb") as f:
+                match = PROFILE_FIELD_PATTERN.search(f.read())
+            if not match:
+                logger.warning("Could not read profile from %s", entry.name)
+                continue
+
+            profile_id = match.group(1).decode("utf-8")
+            existing_profiles.add(profile_id)
+            index.write(
+                orjson.dumps({"doc_id": entry.name[:-len(".json")], "profile": profile_id})
+                + b"\n"
+            )
 
     return existing_profiles
 
 
+def generate_documents(
+    builder, profiles, total_docs, output_dir, llm_client=None, concurrency=1,
+    stream=False, writer=None,
+):
+    """
+    Build prompts for each profile and save the resulting documents
+    LLM calls run on a thread pool with up to `concurrency` requests in flight;
+    prompts are built on the calling thread and documents handed to `writer`
+    """
+    jobs = (
+        (i, *builder.build_prompt(profile), generate_timestamp())
+        for i, profile in enumerate(profiles, 1)
+    )
+
+    if not llm_client:
+        for i, prompt, structure_name, profile_id, timestamp in jobs:
+            print(f"[{i}/{total_docs}] Generated: {structure_name}_{profile_id}_{timestamp}")
+            save_document(
+                output_dir, structure_name, profile_id, timestamp, prompt, writer=writer
+            )
+        return
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = {}
+        for job in jobs:
+            if len(pending) >= concurrency:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    _save_generated(
+                        future, pending.pop(future), total_docs, output_dir, writer
+                    )
+
+            _, prompt, structure_name, profile_id, _ = job
+            logger.info("Generating content for %s_%s", structure_name, profile_id)
+            pending[executor.submit(generate_content, llm_client, prompt, stream)] = job
+
+        for future in list(pending):
+            _save_generated(future, pending.pop(future), total_docs, output_dir, writer)
+
+
+def generate_content(llm_client, prompt, stream=False):
+    """
+    Call the LLM and extract the document (runs on a worker thread)
+    Returns (content, doc_id); doc_id is None unless streaming already hashed it
+    """
+    if not stream:
+        return extract_output_content(llm_client.generate(prompt)), None
+
+    extractor = StreamingExtractor()
+    for chunk in llm_client.stream(prompt):
+        extractor.feed(chunk)
+    return extractor.finish()
+
+
+def _save_generated(future, job, total_docs, output_dir, writer=None):
+    """
+    Extract and save the document from a finished LLM call
+    Errors are logged and the document skipped
+    """
+    i, prompt, structure_name, profile_id, timestamp = job
+
+    try:
+        content, doc_id = future.result()
+        logger.info(
+            "Successfully generated content for %s_%s (length=%d chars)",
+            structure_name, profile_id, len(content),
+        )
+    except Exception as e:
+        logger.error(
+            "Error generating content for %s_%s: %s",
+            structure_name, profile_id, e,
+        )
+        print(f"[{i}/{total_docs}] error: {structure_name}_{profile_id} - {e}")
+        return
+
+    print(f"[{i}/{total_docs}] Generated: {structure_name}_{profile_id}_{timestamp}")
+    save_document(
+        output_dir, structure_name, profile_id, timestamp, prompt, content,
+        doc_id=doc_id, writer=writer,
+    )
+
+
 def main():
     base_dir = Path(__file__).parent
 
@@ -141,7 +496,9 @@ def main():
         enabled_structures=enabled_structures,
         style_file=style_file,
         content_file=content_file,
-        domain=domain
+        domain=domain,
+        include_style=pipeline_config["prompt_config"]["include_style"],
+        include_content=pipeline_config["prompt_config"]["include_content"],
     )
 
     builder.load_profiles(profile_files)
@@ -158,6 +515,10 @@ def main():
     llm_config = pipeline_config.get("llm", {})
     llm_client = None
 
+    concurrency = llm_config.get("concurrency", 8)
+    if isinstance(concurrency, bool) or not isinstance(concurrency, int) or concurrency < 1:
+        raise ValueError(f"llm.concurrency must be a positive integer, got: {concurrency!r}")
+
     if llm_config.get("enabled", False):
         provider = llm_config.get("provider", "none")
         try:
@@ -165,12 +526,12 @@ def main():
             llm_client = create_llm_client(llm_config)
             if llm_client:
                 print("LLM client initialised")
-                logger.info(f"LLM client initialised: {provider}")
+                logger.info("LLM client initialised: %s", provider)
             else:
                 print("LLM generation disabled (provider set to 'none')")
         except Exception as e:
             print(f"Error initialising LLM client: {e}")
-            logger.error(f"Failed to initialize LLM client: {e}")
+            logger.error("Failed to initialize LLM client: %s", e)
             return
     else:
         print("LLM generation disabled (saving prompts only)")
@@ -179,23 +540,28 @@ def main():
     output_dir = base_dir / "output" / pipeline_config["output"]["subdirectory"]
     print(f"Output directory: {output_dir}")
 
+    # always read existing profiles before writing anything: this rebuilds the
+    # sidecar index if it is missing or stale, so appends only ever extend a
+    # complete index
+    existing_profiles = get_existing_profile_ids(output_dir)
+
     # skip_existing flag to filter profiles
     skip_existing = pipeline_config["output"].get("skip_existing", False)
 
     if skip_existing:
-        existing_profiles = get_existing_profile_ids(output_dir)
         filtered_count = builder.profile_loader.filter_existing_profiles(
             existing_profiles
         )
         print(f"Skip existing enabled: Filtered out {filtered_count} existing profiles")
         logger.info(
-            f"Skip existing enabled: {filtered_count} profiles already generated"
+            "Skip existing enabled: %s profiles already generated",
+            filtered_count,
         )
 
     mode = pipeline_config["profile_selection"]["mode"]
+    if mode not in ("sequential", "random"):
+        raise ValueError(f"Unknown profile selection mode: {mode}")
     count = pipeline_config["profile_selection"]["count"]
-    include_style = pipeline_config["prompt_config"]["include_style"]
-    include_content = pipeline_config["prompt_config"]["include_content"]
 
     total_docs = builder.get_profile_count() if count == -1 else count
 
@@ -203,65 +569,35 @@ def main():
     print(f"Generating {total_docs} {action} in '{mode}' mode...")
     print("#" * 60)
 
-    # todo: can refactor this as sequential and random share identical code
     if mode == "sequential":
-        for i, profile in enumerate(builder.get_sequential_profiles(), 1):
-            if i > total_docs:
-                break
-
-            prompt, structure_name, profile_id = builder.build_prompt(
-                profile, include_style, include_content
-            )
-            timestamp = generate_timestamp()
-
-            content = None
-            if llm_client:
-                try:
-                    logger.info(f"Generating content for {structure_name}_{profile_id}")
-                    response = llm_client.generate(prompt)
-                    content = extract_output_content(response)
-                    logger.info(
-                        f"Successfully generated content for {structure_name}_{profile_id} (length={len(content)} chars)"
-                    )
-                except Exception as e:
-                    logger.error(f"Error generating content for {structure_name}_{profile_id}: {e}")
-                    print(f"[{i}/{total_docs}] error: {structure_name}_{profile_id} - {e}")
-                    continue
-
-            print(f"[{i}/{total_docs}] Generated: {structure_name}_{profile_id}_{timestamp}")
-            save_document(output_dir, structure_name, profile_id, timestamp, prompt, content)
-
-    elif mode == "random":
-        for i in range(1, total_docs + 1):
-            profile = builder.get_random_profile()
-
-            prompt, structure_name, profile_id = builder.build_prompt(
-                profile, include_style, include_content
-            )
-            timestamp = generate_timestamp()
-
-            content = None
-            if llm_client:
-                try:
-                    logger.info(f"Generating content for {structure_name}_{profile_id}")
-                    response = llm_client.generate(prompt)
-                    content = extract_output_content(response)
-                    logger.info(
-                        f"Successfully generated content for {structure_name}_{profile_id} (length={len(content)} chars)"
-                    )
-                except Exception as e:
-                    logger.error(f"Error generating content for {structure_name}_{profile_id}: {e}")
-                    print(f"[{i}/{total_docs}] error: {structure_name}_{profile_id} - {e}")
-                    continue
-
-            print(f"[{i}/{total_docs}] Generated: {structure_name}_{profile_id}_{timestamp}")
-            save_document(output_dir, structure_name, profile_id, timestamp, prompt, content)
+        profiles = itertools.islice(builder.get_sequential_profiles(), total_docs)
+    else:
+        profiles = (builder.get_random_profile() for _ in range(total_docs))
+
+    output_dir_str = os.fspath(output_dir)
+    os.makedirs(output_dir_str, exist_ok=True)
+    pretty_json = pipeline_config["output"].get("pretty_json", False)
+    with DocumentWriter(pretty_json=pretty_json) as writer:
+        generate_documents(
+            builder,
+            profiles,
+            total_docs,
+            output_dir_str,
+            llm_client=llm_client,
+            concurrency=concurrency,
+            stream=llm_config.get("stream", False),
+            writer=writer,
+        )
 
     print("#" * 60)
     print(f"Generated {total_docs} {action}")
     print(f"Saved to: {output_dir}")
-    logger.info(f"Pipeline completed successfully. Generated {total_docs} {action}")
+    logger.info("Pipeline completed successfully. Generated %s %s", total_docs, action)
 
 
 if __name__ == "__main__":
-    main()
+    log_listener = configure_logging()
+    try:
+        main()
+    finally:
+        log_listener.stop()
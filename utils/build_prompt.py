@@ -17,10 +17,15 @@ class PromptBuilder:
         style_file=None,
         content_file=None,
         domain=None,
+        include_style=True,
+        include_content=True,
     ):
         """
         Initialise with config parameters
         """
+        self.include_style = include_style
+        self.include_content = include_content
+
         self.config_sampler = ConfigSampler(style_file, content_file)
         self.profile_loader = ProfileLoader(domain)
         self.structure_loader = StructureLoader(enabled_structures)
@@ -31,6 +36,13 @@ class PromptBuilder:
         with open(template_path, "r") as f:
             self.template = f.read()
 
+        # split the template at each {specific_instructions}, so build_prompt
+        # only joins the parts rather than formatting the whole template
+        marker = "\0SPECIFIC_INSTRUCTIONS\0"
+        self._template_parts = self.template.format(
+            specific_instructions=marker
+        ).split(marker)
+
     def load_profiles(self, profile_files=None):
         """
         Load profiles from specified file(s) or all profiles
@@ -58,12 +70,19 @@ class PromptBuilder:
         """
         return self.profile_loader.get_sequential_profiles()
 
-    def build_prompt(self, profile, include_style=True, include_content=True):
+    def build_prompt(self, profile):
         """
         Assemble complete prompt for a given profile
+        Style / content are included as set in __init__
         """
-        # style / content
-        style_prompt, content_prompt = self.config_sampler.generate_prompts()
+        components = []
+
+        # style / content (only sampled when included)
+        if self.include_style:
+            components.append(self.config_sampler.generate_style_prompt())
+
+        if self.include_content:
+            components.append(self.config_sampler.generate_content_prompt())
 
         # profile
         profile_prompt = self.profile_loader.format_profile_prompt(profile)
@@ -88,23 +107,12 @@ class PromptBuilder:
             )
 
         # assemble!
-        components = []
-
-        if include_style:
-            components.append(style_prompt)
-
-        if include_content:
-            components.append(content_prompt)
-
         components.append(profile_prompt)
         components.append(names_prompt)
 
         if structure_prompt:
             components.append(structure_prompt)
 
-        specific_instructions = "\n\n".join(components)
-        complete_prompt = self.template.format(
-            specific_instructions=specific_instructions
-        )
+        complete_prompt = "\n\n".join(components).join(self._template_parts)
 
         return complete_prompt, structure_name, profile["profile_id"]
@@ -1,7 +1,7 @@
 import logging
 import os
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Iterator, Optional
 
 """
 llm_clients.py - LLM client abstractions for calling different API providers.
@@ -29,6 +29,21 @@ class LLMClient(ABC):
         """
         pass
 
+    def stream(self, prompt: str) -> Iterator[str]:
+        """
+        Stream a response from the LLM as text chunks.
+
+        Clients without native streaming yield the full response as one chunk.
+
+        Args:
+            prompt:
+                Prompt to send to the LLM
+
+        Returns:
+            Iterator over raw response text chunks
+        """
+        yield self.generate(prompt)
+
 
 class GeminiClient(LLMClient):
     """
@@ -68,65 +83,85 @@ class GeminiClient(LLMClient):
         self.model = self.genai.GenerativeModel(model)
 
         logger.info(
-            f"Initialized GeminiClient with model={model}, temperature={temperature}, max_tokens={max_tokens}"
+            "Initialized GeminiClient with model=%s, temperature=%s, max_tokens=%s",
+            model, temperature, max_tokens,
         )
 
     def generate(self, prompt: str) -> str:
         """
         Generate response from Gemini.
         """
-        logger.debug(f"Sending prompt to Gemini (length={len(prompt)} chars)")
+        logger.debug("Sending prompt to Gemini (length=%d chars)", len(prompt))
 
         try:
-            # Disable all safety filters to allow medical/technical content generation
-            safety_settings = [
-                {
-                    "category": self.genai.types.HarmCategory.HARM_CATEGORY_HARASSMENT,
-                    "threshold": self.genai.types.HarmBlockThreshold.BLOCK_NONE,
-                },
-                {
-                    "category": self.genai.types.HarmCategory.HARM_CATEGORY_HATE_SPEECH,
-                    "threshold": self.genai.types.HarmBlockThreshold.BLOCK_NONE,
-                },
-                {
-                    "category": self.genai.types.HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT,
-                    "threshold": self.genai.types.HarmBlockThreshold.BLOCK_NONE,
-                },
-                {
-                    "category": self.genai.types.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
-                    "threshold": self.genai.types.HarmBlockThreshold.BLOCK_NONE,
-                },
-            ]
-
-            response = self.model.generate_content(
-                prompt,
-                generation_config={
-                    "temperature": self.temperature,
-                    "max_output_tokens": self.max_tokens,
-                },
-                safety_settings=safety_settings,
-            )
+            response = self.model.generate_content(prompt, **self._request_options())
 
             # Check if response was blocked by safety filters
             if not response.parts:
-                finish_reason = (
-                    response.candidates[0].finish_reason
-                    if response.candidates
-                    else None
-                )
-                logger.error(f"Gemini blocked response. Finish reason: {finish_reason}")
-                raise ValueError(
-                    f"Response blocked by Gemini. Finish reason: {finish_reason}"
-                )
+                self._raise_blocked(response)
 
             result = response.text
-            logger.debug(f"Received response from Gemini (length={len(result)} chars)")
+            logger.debug("Received response from Gemini (length=%d chars)", len(result))
             return result
 
         except Exception as e:
-            logger.error(f"Error generating from Gemini: {e}")
+            logger.error("Error generating from Gemini: %s", e)
+            raise
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """
+        Stream response from Gemini.
+        """
+        logger.debug("Streaming prompt to Gemini (length=%d chars)", len(prompt))
+
+        try:
+            response = self.model.generate_content(
+                prompt, stream=True, **self._request_options()
+            )
+
+            received = False
+            for chunk in response:
+                if chunk.parts:
+                    received = True
+                    yield chunk.text
+
+            # Check if response was blocked by safety filters
+            if not received:
+                self._raise_blocked(response)
+
+        except Exception as e:
+            logger.error("Error streaming from Gemini: %s", e)
             raise
 
+    def _request_options(self) -> dict:
+        # Disable all safety filters to allow medical/technical content generation
+        harm_category = self.genai.types.HarmCategory
+        block_none = self.genai.types.HarmBlockThreshold.BLOCK_NONE
+        safety_settings = [
+            {"category": category, "threshold": block_none}
+            for category in (
+                harm_category.HARM_CATEGORY_HARASSMENT,
+                harm_category.HARM_CATEGORY_HATE_SPEECH,
+                harm_category.HARM_CATEGORY_SEXUALLY_EXPLICIT,
+                harm_category.HARM_CATEGORY_DANGEROUS_CONTENT,
+            )
+        ]
+
+        return {
+            "generation_config": {
+                "temperature": self.temperature,
+                "max_output_tokens": self.max_tokens,
+            },
+            "safety_settings": safety_settings,
+        }
+
+    def _raise_blocked(self, response):
+        finish_reason = (
+            response.candidates[0].finish_reason if response.candidates else None
+        )
+        logger.error("Gemini blocked response. Finish reason: %s", finish_reason)
+        raise ValueError(f"Response blocked by Gemini. Finish reason: {finish_reason}")
+
 
 class ClaudeClient(LLMClient):
     """
@@ -162,14 +197,15 @@ class ClaudeClient(LLMClient):
         self.max_tokens = max_tokens
 
         logger.info(
-            f"Initialized ClaudeClient with model={model}, temperature={temperature}, max_tokens={max_tokens}"
+            "Initialized ClaudeClient with model=%s, temperature=%s, max_tokens=%s",
+            model, temperature, max_tokens,
         )
 
     def generate(self, prompt: str) -> str:
         """
         Generate response from Claude.
         """
-        logger.debug(f"Sending prompt to Claude (length={len(prompt)} chars)")
+        logger.debug("Sending prompt to Claude (length=%d chars)", len(prompt))
 
         try:
             response = self.client.messages.create(
@@ -180,11 +216,30 @@ class ClaudeClient(LLMClient):
             )
 
             result = response.content[0].text
-            logger.debug(f"Received response from Claude (length={len(result)} chars)")
+            logger.debug("Received response from Claude (length=%d chars)", len(result))
             return result
 
         except Exception as e:
-            logger.error(f"Error generating from Claude: {e}")
+            logger.error("Error generating from Claude: %s", e)
+            raise
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """
+        Stream response from Claude.
+        """
+        logger.debug("Streaming prompt to Claude (length=%d chars)", len(prompt))
+
+        try:
+            with self.client.messages.stream(
+                model=self.model,
+                max_tokens=self.max_tokens,
+                temperature=self.temperature,
+                messages=[{"role": "user", "content": prompt}],
+            ) as stream:
+                yield from stream.text_stream
+
+        except Exception as e:
+            logger.error("Error streaming from Claude: %s", e)
             raise
 
 
@@ -230,14 +285,15 @@ class LocalClient(LLMClient):
         )
 
         logger.info(
-            f"Initialised LocalClient with base_url={base_url}, model={model}, temperature={temperature}, max_tokens={max_tokens}"
+            "Initialised LocalClient with base_url=%s, model=%s, temperature=%s, max_tokens=%s",
+            base_url, model, temperature, max_tokens,
         )
 
     def generate(self, prompt: str) -> str:
         """
         Generate response from local API.
         """
-        logger.debug(f"Sending prompt to local API (length={len(prompt)} chars)")
+        logger.debug("Sending prompt to local API (length=%d chars)", len(prompt))
 
         try:
             response = self.client.chat.completions.create(
@@ -249,12 +305,36 @@ class LocalClient(LLMClient):
 
             result = response.choices[0].message.content
             logger.debug(
-                f"Received response from local API (length={len(result)} chars)"
+                "Received response from local API (length=%d chars)",
+                len(result),
             )
             return result
 
         except Exception as e:
-            logger.error(f"Error generating from local API: {e}")
+            logger.error("Error generating from local API: %s", e)
+            raise
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """
+        Stream response from local API.
+        """
+        logger.debug("Streaming prompt to local API (length=%d chars)", len(prompt))
+
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=self.temperature,
+                max_tokens=self.max_tokens,
+                stream=True,
+            )
+
+            for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        except Exception as e:
+            logger.error("Error streaming from local API: %s", e)
             raise
 
 
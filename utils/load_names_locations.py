@@ -1,48 +1,83 @@
+import functools
 import random
+from collections import deque
 from pathlib import Path
-import yaml
+
+from utils.load_yaml import load_yaml
 
 """
 load_names_locations.py - simple random sampling of names and locations
 """
 
+SAMPLE_BATCH_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=1)
+def _load_config():
+    """
+    Parse names_locations.yml once per process
+    """
+    config_path = Path(__file__).parent.parent / "config" / "names_locations.yml"
+    return load_yaml(config_path)
+
 
 class NamesLocationsLoader:
     def __init__(self):
         """
         Load names and locations from config file
         """
-        base_dir = Path(__file__).parent.parent
-        config_path = base_dir / "config" / "names_locations.yml"
+        data = _load_config()
+
+        self.patient_names = tuple(data["patient_names"])
+        self.clinician_names = tuple(data["clinician_names"])
+        self.providers = tuple(data["providers"])
+        self.wards_clinics = tuple(data["wards_clinics"])
 
-        with open(config_path, "r") as f:
-            data = yaml.safe_load(f)
+        # instance rng + queue of pre-sampled tuples, refilled in batches
+        self._rng = random.Random()
+        self._samples = deque()
 
-        self.patient_names = data["patient_names"]
-        self.clinician_names = data["clinician_names"]
-        self.providers = data["providers"]
-        self.wards_clinics = data["wards_clinics"]
+        self._header = "## USE THESE NAMES AND LOCATIONS (BUT REDACT AS PROMPTED)\n\n"
+
+    def prefill_samples(self, n=SAMPLE_BATCH_SIZE):
+        """
+        Refill the sample queue with n entries from each list, one batch call
+        per list; sample() calls this whenever the queue runs dry
+        """
+        choices = self._rng.choices
+        self._samples.extend(
+            zip(
+                choices(self.patient_names, k=n),
+                choices(self.clinician_names, k=n),
+                choices(self.providers, k=n),
+                choices(self.wards_clinics, k=n),
+            )
+        )
 
     def sample(self):
         """
         Randomly sample one from each list and return as dict
+        Pops from the pre-sampled queue, refilling it when empty
         """
+        if not self._samples:
+            self.prefill_samples()
+
+        patient_name, clinician_name, provider, ward_clinic = self._samples.popleft()
         return {
-            "patient_name": random.choice(self.patient_names),
-            "clinician_name": random.choice(self.clinician_names),
-            "provider": random.choice(self.providers),
-            "ward_clinic": random.choice(self.wards_clinics),
+            "patient_name": patient_name,
+            "clinician_name": clinician_name,
+            "provider": provider,
+            "ward_clinic": ward_clinic,
         }
 
     def format_prompt(self, sampled):
         """
         Format sampled names/locations into prompt text
         """
-        lines = ["## USE THESE NAMES AND LOCATIONS (BUT REDACT AS PROMPTED)"]
-        lines.append("")
-        lines.append(f"**Patient Name:** {sampled['patient_name']}")
-        lines.append(f"**Clinician Name:** {sampled['clinician_name']}")
-        lines.append(f"**Hospital/Practice:** {sampled['provider']}")
-        lines.append(f"**Ward/Clinic:** {sampled['ward_clinic']}")
-        lines.append("")
-        return "\n".join(lines)
+        return (
+            f"{self._header}"
+            f"**Patient Name:** {sampled['patient_name']}\n"
+            f"**Clinician Name:** {sampled['clinician_name']}\n"
+            f"**Hospital/Practice:** {sampled['provider']}\n"
+            f"**Ward/Clinic:** {sampled['ward_clinic']}\n"
+        )
@@ -2,7 +2,7 @@ import random
 import re
 from pathlib import Path
 
-import yaml
+from utils.load_yaml import load_yaml
 
 """
 load_profiles.py - loads in cancer & molecular profiles
@@ -48,8 +48,7 @@ class ProfileLoader:
         """
         Load profiles from YAML file taking all fields
         """
-        with open(file_path, "r") as f:
-            data = yaml.safe_load(f)
+        data = load_yaml(file_path)
 
         profiles = []
 
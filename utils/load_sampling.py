@@ -1,6 +1,7 @@
 import random
 from pathlib import Path
-import yaml
+
+from utils.load_yaml import load_yaml
 
 """
 load_sampling.py - probabilistic sampling from config files into prompt
@@ -28,8 +29,7 @@ class ConfigSampler:
         self.content_data = self._load_yaml(self.content_path)
 
     def _load_yaml(self, path):
-        with open(path, "r") as f:
-            return yaml.safe_load(f)
+        return load_yaml(path)
 
     def _sample_section(self, section_data):
         mutually_exclusive = section_data.get("_mutually_exclusive", False)
@@ -94,9 +94,13 @@ class ConfigSampler:
 
         return "\n".join(lines).strip()
 
+    def generate_style_prompt(self):
+        return self.format_style_prompt(self.sample_style_config())
+
+    def generate_content_prompt(self):
+        return self.format_content_prompt(self.sample_content_config())
+
     def generate_prompts(self):
-        style_config = self.sample_style_config()
-        content_config = self.sample_content_config()
-        style_prompt = self.format_style_prompt(style_config)
-        content_prompt = self.format_content_prompt(content_config)
+        style_prompt = self.generate_style_prompt()
+        content_prompt = self.generate_content_prompt()
         return style_prompt, content_prompt
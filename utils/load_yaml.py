@@ -0,0 +1,18 @@
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+"""
+load_yaml.py - yaml loading using libyaml's C loader when available
+"""
+
+
+def load_yaml(path):
+    """
+    Safe-load a yaml file (falls back to pure python loader without libyaml)
+    """
+    with open(path, "r") as f:
+        return yaml.load(f, Loader=SafeLoader)